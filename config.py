@@ -11,6 +11,7 @@ import os
 
 # Path for identifying where the EventStudio executable is installed. Set to None
 # for the script to find the EventStudio path from the installed vscode extension.
+# Environment variables such as %ProgramFiles% are expanded in the path.
 eventStudioPath = None
 
 # Specifies the path where Visual Studio code extensions are installed in Windows
@@ -19,6 +20,8 @@ eventStudioPath = None
 vsCodeExtensions = r'%USERPROFILE%\.vscode\extensions'
 
 # The EventStudio command line to be used to generate the sequence diagrams.
+# Environment variables such as %USERPROFILE% are expanded. The command is run
+# directly, not through a command shell.
 eventStudioCommandLine = r'{eventStudio} build project.scn.json'
 
 # The indentation to be used in generating the FDL file.
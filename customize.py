@@ -7,8 +7,6 @@
 .. moduleauthor:: EventHelix.com Inc.
 
 """
-from collections import OrderedDict
-
 # The trace messages follow this high level format. The current regular expression
 # assumes that all traces are of the format:
 #
@@ -32,7 +30,7 @@ from collections import OrderedDict
 #               expression definitions for parsing of the body for different
 #               trace types.
 
-traceRegex = r'\[(?P<time>.*)\]\s*\[(?P<generator>.*)\]\[(?P<file>.*)\]\s*(?P<type>\S+)\s+(?P<body>.*)'
+traceRegex = r'\[(?P<time>[^\]]*)\]\s*\[(?P<generator>[^\]]*)\]\[(?P<file>[^\]]*)\]\s*(?P<type>\S+)\s+(?P<body>.*)'
 
 # Map the type of the trace to the trace handler that will parse the trace body and
 # extract the information needed for generating an FDL statement.
@@ -169,15 +167,15 @@ bookmarkTemplate = r'heading "{bookmark}"'
 # understanding the trace output at a higher level of abstraction.
 #
 # List the interacting entities along with their parent. For example, the
-# tuples below indicate that DSP_01 and DSP_23 belong to the same high level PHY entity.
+# entries below indicate that DSP_01 and DSP_23 belong to the same high level PHY entity.
 # This means EventStudio will generate trace output at two levels:
 # - A sequence diagram where DSP_01 and DSP_23 show up as separate axis.
 # - A high level sequence diagram where PHY axis abstracts out the interactions
 #   involving DSP_01 and DSP_23
 # Just include the parent information for external actors in the system. Object parents
 # for internal actors are extracted from the trace contents.
-objectParents = OrderedDict([
-    # Tuples of object and its parent
-    # (entity, parent)
+objectParents = {
+    # Object and its parent
+    # 'entity' : 'parent',
 
-])
+}
@@ -11,7 +11,7 @@
 """
 
 import re
-from collections import OrderedDict
+from functools import lru_cache
 
 import config
 import customize
@@ -19,18 +19,22 @@ import customize
 
 def trimSplit(s, sep):
     """
-    Take a string and split it across the separator.
+    Take a string and split it across the first occurrence of the separator.
 
     :param s: string to be split
     :param sep: separator to be used for splitting
     :rtype: tuple of strings (extra blank spaces are removed)
     """
-    if sep in s:
-        s1,s2 = s.split(sep)
+    s1, found, s2 = s.partition(sep)
+    if found:
         return s1.strip(), s2.strip()
     else:
         return '',''
 
+# The same parameter strings recur throughout a trace, so the formatted results are cached.
+# Like the trace regular expressions, the customize.py parameter settings are
+# treated as fixed once this module is imported.
+@lru_cache(maxsize=4096)
 def formatParams(paramString):
     """
     Parse the format string, reformat it and store it as a valid parameter string
@@ -41,14 +45,12 @@ def formatParams(paramString):
     :rtype: string that is suitable for FDL statements.
     """
     avPairStr = ''
-    if paramString != None and len(paramString) != 0 and customize.attributeValueSeparator in paramString:
-        avPairStr = '('
-        avpairList = [trimSplit(item, customize.attributeValueSeparator) for item in paramString.split(customize.avpairSeparator)]
-        for att,val in avpairList:
-            avPairStr += str.format(customize.paramTemplate, attribute=att, value=val)
-            avPairStr += ','
-        avPairStr = avPairStr[:-1]
-        avPairStr += ')'
+    separator = customize.attributeValueSeparator
+    if paramString and separator in paramString:
+        # Bind the template format method once instead of looking it up for every pair
+        paramFormat = customize.paramTemplate.format
+        avpairList = [trimSplit(item, separator) for item in paramString.split(customize.avpairSeparator)]
+        avPairStr = '(' + ','.join([paramFormat(attribute=att, value=val) for att,val in avpairList]) + ')'
     return avPairStr
 
 
@@ -56,8 +58,16 @@ class Statement:
     """
     Base class for representing FDL statements.
     """
-    def __init__(self):
-        self.attributes = {}
+    __slots__ = ('attributes', 'remarks')
+
+    def __init__(self, attributes=None):
+        """
+        Initialize the statement.
+
+        :param attributes: Dictionary of attributes extracted from the trace. An empty
+                           dictionary is used if no attributes are passed.
+        """
+        self.attributes = {} if attributes is None else attributes
         self.remarks = ''
 
 
@@ -70,11 +80,12 @@ class Statement:
 
     def entityList(self):
         """
-        Override this method to return a list containing the entities derived
+        Override this method to return a tuple containing the entities derived
         from the trace command. For example, a message list will return two
-        entries while an action statement will return one entity.
+        entries while an action statement will return one entity. The tuple is
+        a constant, so no new object is allocated for each statement.
         """
-        return []
+        return ()
 
     def bookmarkAttribute(self):
         """
@@ -93,9 +104,8 @@ class Statement:
         :rvalue: string containing the complete FDL statement (including the
                  correct indentation and the remark.
         """
-        fdlText = config.indent + self.convertToFDL() + '\n'+ config.indent
-        fdlText += self.remarks + '\n\n'
-        return fdlText
+        indent = config.indent
+        return f'{indent}{self.convertToFDL()}\n{indent}{self.remarks}\n\n'
 
     def attributeUpdate(self, traceAttributes):
         """
@@ -103,7 +113,7 @@ class Statement:
         extracts the relevant attributes from this method.
         :param traceAttributes: List of attributes extracted from the trace.
         """
-        self.remarks = str.format(customize.remarkTemplate, **traceAttributes)
+        self.remarks = customize.remarkTemplate.format_map(traceAttributes)
 
 
 
@@ -113,16 +123,19 @@ class MessageStatement(Statement):
     Represents the FDL message statement. This class is used in message sent and
     receive processing.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.messageTemplate, **self.attributes)
+        return customize.messageTemplate.format_map(self.attributes)
 
     def bookmarkAttribute(self):
         return 'message'
 
 class MessageReceiveStatement(MessageStatement):
+    __slots__ = ()
 
     def entityList(self):
-        return [('destination','any'),('source','any')]
+        return (('destination','any'),('source','any'))
 
 # Compile the regular expression for received message extraction from the trace body.
 messageReceiveRegex = re.compile(customize.messageRxRegex)
@@ -140,18 +153,18 @@ def MessageReceive(traceType, traceGenerator, traceText):
     """
     statement = None
     messageGroup = messageReceiveRegex.search(traceText)
-    if messageGroup != None:
-         statement = MessageReceiveStatement()
-         statement.attributes = messageGroup.groupdict()
+    if messageGroup is not None:
+         statement = MessageReceiveStatement(messageGroup.groupdict())
          statement.attributes['destination'] = traceGenerator
          if 'params' in statement.attributes:
             statement.attributes['params'] = formatParams(statement.attributes['params'])
     return statement
 
 class MessageSendStatement(MessageStatement):
+    __slots__ = ()
 
     def entityList(self):
-        return [('source','any'),('destination','any')]
+        return (('source','any'),('destination','any'))
 
 messageSentRegex = re.compile(customize.messageTxRegex)
 def MessageSent(traceType, traceGenerator, traceText):
@@ -167,9 +180,8 @@ def MessageSent(traceType, traceGenerator, traceText):
     """
     statement = None
     messageGroup = messageSentRegex.search(traceText)
-    if messageGroup != None:
-         statement = MessageSendStatement()
-         statement.attributes = messageGroup.groupdict()
+    if messageGroup is not None:
+         statement = MessageSendStatement(messageGroup.groupdict())
          statement.attributes['source'] = traceGenerator
          if 'params' in statement.attributes:
             statement.attributes['params'] = formatParams(statement.attributes['params'])
@@ -179,11 +191,13 @@ class InvokeStatement(Statement):
     """
     Represents the FDL method invoke statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.invokeTemplate, **self.attributes)
+        return customize.invokeTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('called','any'),('caller', 'any')]
+        return (('called','any'),('caller', 'any'))
 
     def bookmarkAttribute(self):
         return 'method'
@@ -212,9 +226,8 @@ def MethodInvoke(traceType, traceGenerator, traceText):
         invokeGroup = invokeFunctionRegex.search(traceText)
         cfunction = True
 
-    if invokeGroup != None:
-        statement = InvokeStatement()
-        statement.attributes = invokeGroup.groupdict()
+    if invokeGroup is not None:
+        statement = InvokeStatement(invokeGroup.groupdict())
         statement.attributes['caller'] = traceGenerator
 
         if cfunction:
@@ -231,11 +244,13 @@ class ReturnStatement(Statement):
     """
     Represents the FDL method return statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.returnTemplate, **self.attributes)
+        return customize.returnTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('called','any')]
+        return (('called','any'),)
 
 methodReturnRegex = re.compile(customize.methodReturnRegex)
 functionReturnRegex = re.compile(customize.functionReturnRegex)
@@ -261,9 +276,8 @@ def MethodReturn(traceType, traceGenerator, traceText):
         returnGroup = functionReturnRegex.search(traceText)
         cfunction = True
 
-    if returnGroup != None:
-        statement = ReturnStatement()
-        statement.attributes = returnGroup.groupdict()
+    if returnGroup is not None:
+        statement = ReturnStatement(returnGroup.groupdict())
         if cfunction:
             # FDL requires an object name and method name. In C functions
             # the function name (designated as method) is also used as
@@ -279,11 +293,13 @@ class CreateStatement(Statement):
     """
     Represents the FDL object create statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.createTemplate, **self.attributes)
+        return customize.createTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('creator','any'), ('created', 'dynamic-created')]
+        return (('creator','any'), ('created', 'dynamic-created'))
 
 createRegex = re.compile(customize.createRegex)
 def CreateObject(traceType, traceGenerator, traceText):
@@ -299,9 +315,8 @@ def CreateObject(traceType, traceGenerator, traceText):
     """
     statement = None
     createGroup = createRegex.search(traceText)
-    if createGroup != None:
-        statement = CreateStatement()
-        statement.attributes = createGroup.groupdict()
+    if createGroup is not None:
+        statement = CreateStatement(createGroup.groupdict())
         statement.attributes['creator'] = traceGenerator
         if 'params' in statement.attributes:
             statement.attributes['params'] = formatParams(statement.attributes['params'])
@@ -311,11 +326,13 @@ class DeleteStatement(Statement):
     """
     Represents the FDL object delete statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.deleteTemplate, **self.attributes)
+        return customize.deleteTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('deletor','any'), ('deleted', 'dynamic-deleted')]
+        return (('deletor','any'), ('deleted', 'dynamic-deleted'))
 
 deleteRegex = re.compile(customize.deleteRegex)
 def DeleteObject(traceType, traceGenerator, traceText):
@@ -331,9 +348,8 @@ def DeleteObject(traceType, traceGenerator, traceText):
     """
     statement = None
     deleteGroup = deleteRegex.search(traceText)
-    if deleteGroup != None:
-        statement = DeleteStatement()
-        statement.attributes = deleteGroup.groupdict()
+    if deleteGroup is not None:
+        statement = DeleteStatement(deleteGroup.groupdict())
         statement.attributes['deletor'] = traceGenerator
     return statement
 
@@ -344,105 +360,114 @@ class TimerStatement(Statement):
     Represents the FDL timer statements. This class acts as the base class for
     all the timer management statements.
     """
+    __slots__ = ()
+
     def bookmarkAttribute(self):
         return 'timer'
 
+def _timerStatement(statementClass, traceGenerator, traceText):
+    """
+    Private function: parse the traceText of a timer trace. The timer start, stop
+    and expiry traces are parsed the same way and only differ in the statement
+    object that is returned.
+
+    :param statementClass: TimerStatement subclass to be returned.
+    :param traceGenerator: object generating the trace
+    :param traceText: string containing the raw trace body
+    :rtype: statement object containing information about the trace.
+    """
+    statement = None
+    timerGroup = timerRegex.search(traceText)
+    if timerGroup is not None:
+        statement = statementClass({'object': traceGenerator, 'timer': traceText.strip()})
+    return statement
+
 class StartTimerStatement(TimerStatement):
     """
     Represents FDL timer start.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.startTimerTemplate, **self.attributes)
+        return customize.startTimerTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
 def StartTimer(traceType, traceGenerator, traceText):
     """
     Parse the traceText of a timer start and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    The raw string trace body is checked with the help of the timer regular
+    expression defined in customize.py file.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = None
-    timerGroup = timerRegex.search(traceText)
-    if timerGroup != None:
-        statement = StartTimerStatement()
-        statement.attributes['object'] = traceGenerator
-        statement.attributes['timer'] = traceText.strip()
-    return statement
+    return _timerStatement(StartTimerStatement, traceGenerator, traceText)
 
 class StopTimerStatement(TimerStatement):
     """
     Represents FDL stop statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.stopTimerTemplate, **self.attributes)
+        return customize.stopTimerTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
 def StopTimer(traceType, traceGenerator, traceText):
     """
     Parse the traceText of a timer stop and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    The raw string trace body is checked with the help of the timer regular
+    expression defined in customize.py file.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = None
-    timerGroup = timerRegex.search(traceText)
-    if timerGroup != None:
-        statement = StopTimerStatement()
-        statement.attributes['object'] = traceGenerator
-        statement.attributes['timer'] = traceText.strip()
-    return statement
+    return _timerStatement(StopTimerStatement, traceGenerator, traceText)
 
 class ExpiredTimerStatement(TimerStatement):
     """
     Represents FDL timeout statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.expiredTimerTemplate, **self.attributes)
+        return customize.expiredTimerTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
 def ExpiredTimer(traceType, traceGenerator, traceText):
     """
     Parse the traceText of a timer expiry and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    The raw string trace body is checked with the help of the timer regular
+    expression defined in customize.py file.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = None
-    timerGroup = timerRegex.search(traceText)
-    if timerGroup != None:
-        statement = ExpiredTimerStatement()
-        statement.attributes['object'] = traceGenerator
-        statement.attributes['timer'] = traceText.strip()
-    return statement
+    return _timerStatement(ExpiredTimerStatement, traceGenerator, traceText)
 
 class ActionStatement(Statement):
     """
     Represents the FDL action statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.actionTemplate, **self.attributes)
+        return customize.actionTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('actor','any')]
+        return (('actor','any'),)
 
     def bookmarkAttribute(self):
         return 'action'
@@ -459,21 +484,35 @@ def Action(traceType, traceGenerator, traceText):
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = ActionStatement()
-    statement.attributes['actor'] = traceGenerator
-    statement.attributes['actionType'] = traceType
-    statement.attributes['action'] = traceText.strip()
+    statement = ActionStatement({'actor': traceGenerator, 'actionType': traceType, 'action': traceText.strip()})
     return statement
 
+def _objectStatement(statementClass, attribute, traceGenerator, traceText):
+    """
+    Private function: create the statement for a trace that applies to the object
+    generating the trace. The complete trace body is saved in the statement under
+    the given attribute name. State change, resource and action begin/end traces
+    are handled this way.
+
+    :param statementClass: Statement subclass to be returned.
+    :param attribute: attribute name under which the trace body is saved.
+    :param traceGenerator: object generating the trace
+    :param traceText: string containing the raw trace body
+    :rtype: statement object containing information about the trace.
+    """
+    return statementClass({'object': traceGenerator, attribute: traceText.strip()})
+
 class StateChangeStatement(Statement):
     """
     Represents the FDL state change statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.stateChangeTemplate, **self.attributes)
+        return customize.stateChangeTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
     def bookmarkAttribute(self):
         return 'state'
@@ -481,29 +520,27 @@ class StateChangeStatement(Statement):
 def StateChange(traceType, traceGenerator, traceText):
     """
     Parse the traceText of a state change and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    The trace body is saved as the new state of the object generating the trace.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = StateChangeStatement()
-    statement.attributes['object'] = traceGenerator
-    statement.attributes['state'] = traceText.strip()
-    return statement
+    return _objectStatement(StateChangeStatement, 'state', traceGenerator, traceText)
 
 
 class AllocateStatement(Statement):
     """
     Represents the resource allocation FDL statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.allocateTemplate, **self.attributes)
+        return customize.allocateTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
     def bookmarkAttribute(self):
         return 'resource'
@@ -511,105 +548,95 @@ class AllocateStatement(Statement):
 def AllocatedResource(traceType, traceGenerator, traceText):
     """
     Parse the traceText of a resource allocation and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    The trace body is saved as the allocated resource of the object generating the trace.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = AllocateStatement()
-    statement.attributes['object'] = traceGenerator
-    statement.attributes['resource'] = traceText.strip()
-    return statement
+    return _objectStatement(AllocateStatement, 'resource', traceGenerator, traceText)
 
 class FreeStatement(Statement):
     """
     Represents the resource free FDL statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.freeTemplate, **self.attributes)
+        return customize.freeTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
     def bookmarkAttribute(self):
         return 'resource'
 
 def FreedResource(traceType, traceGenerator, traceText):
     """
-    Parse the traceText of a resource free trace and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    Parse the traceText of a resource release and return a statement object.
+    The trace body is saved as the freed resource of the object generating the trace.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = FreeStatement()
-    statement.attributes['object'] = traceGenerator
-    statement.attributes['resource'] = traceText.strip()
-    return statement
+    return _objectStatement(FreeStatement, 'resource', traceGenerator, traceText)
 
 class BeginActionStatement(Statement):
     """
     Represent an action start FDL statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.beginActionTemplate, **self.attributes)
+        return customize.beginActionTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
     def bookmarkAttribute(self):
         return 'action'
 
 def BeginAction(traceType, traceGenerator, traceText):
     """
-    Parse the traceText of an action start trace and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    Parse the traceText of an action start and return a statement object.
+    The trace body is saved as the started action of the object generating the trace.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = BeginActionStatement()
-    statement.attributes['object'] = traceGenerator
-    statement.attributes['action'] = traceText.strip()
-    return statement
+    return _objectStatement(BeginActionStatement, 'action', traceGenerator, traceText)
 
 class EndActionStatement(Statement):
     """
     Represents the action end FDL statement.
     """
+    __slots__ = ()
+
     def convertToFDL(self):
-        return str.format(customize.endActionTemplate, **self.attributes)
+        return customize.endActionTemplate.format_map(self.attributes)
 
     def entityList(self):
-        return [('object','any')]
+        return (('object','any'),)
 
     def bookmarkAttribute(self):
         return 'action'
 
 def EndAction(traceType, traceGenerator, traceText):
     """
-    Parse the traceText of an end action and return a statement object.
-    The raw string trace body is parsed into a message statement object with the
-    help of the regular expression defined in customize.py file.
+    Parse the traceText of an action end and return a statement object.
+    The trace body is saved as the completed action of the object generating the trace.
 
     :param traceType: string containing the trace type
     :param traceGenerator: object generating the trace
     :param traceText: string containing the raw trace body
     :rtype: statement object containing information about the trace.
     """
-    statement = EndActionStatement()
-    statement.attributes['object'] = traceGenerator
-    statement.attributes['action'] = traceText.strip()
-    return statement
+    return _objectStatement(EndActionStatement, 'action', traceGenerator, traceText)
 
 
 # trace string to the handler mapping is a two step process. The user type string gets mapped
@@ -633,3 +660,9 @@ traceHandlerMapper = {
    'FreedResource'      :   FreedResource,
    'Action'             :   Action
 }
+
+# Both steps are resolved once at import so that the trace type maps directly to the
+# trace handler function. Trace types not listed in customize.traceMapper are handled
+# by the defaultMapping handler.
+traceTypeHandlers = {traceType: traceHandlerMapper[handler] for traceType, handler in customize.traceMapper.items()}
+defaultTraceHandler = traceHandlerMapper[customize.defaultMapping]
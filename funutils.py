@@ -3,7 +3,7 @@
 #   file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 """
-.. automodule:: fdl
+.. automodule:: funutils
    :members:
    :platform: Windows
    :synopsis: Utilities for functional programming in Python.
@@ -53,18 +53,21 @@ class Maybe(NamedTuple('Maybe', [('hasValue', bool) , ('value', a)]), Generic[a]
         """
         Chain potentially failing computations without a nested if statement.
         xs.then(just) ≡ xs
-        xs.then(lambda x: f(x).then(g)) ≡ xs.then(g).then(g)
+        xs.then(lambda x: f(x).then(g)) ≡ xs.then(f).then(g)
         where f and g are pure functions
         """
         if self.hasValue :
             return f(self.value)
-        else : nothing()
+        else : return nothing()
+
+# Maybe is immutable, so a single empty Maybe is shared by all nothing() calls.
+_nothing = Maybe(False, None)
 
 def nothing() -> Maybe[a] :
     """
-    Construct and empty Maybe.
+    Return the empty Maybe.
     """
-    return Maybe(False, None)
+    return _nothing
 
 def just(x : a) -> Maybe[a] :
     """
@@ -72,27 +75,26 @@ def just(x : a) -> Maybe[a] :
     """
     return Maybe(True, x)
 
+# Sentinel returned by next() when no item satisfies the condition in first().
+_notFound = object()
+
 def first(xs : Iterable[a], condition = lambda x: True) -> Maybe[a]:
     """
     Returns the first item in the `iterable` that
-    satisfies the `condition`.
+    satisfies the `condition`, wrapped in a Maybe.
 
     If the condition is not given, returns the first item of
     the iterable.
 
-    Raises `StopIteration` if no item satisfying the condition is found.
+    Returns nothing() if no item satisfying the condition is found.
 
     >>> first( (1,2,3), condition=lambda x: x % 2 == 0)
-    2
+    just(2)
     >>> first(range(3, 100))
-    3
+    just(3)
     >>> first( () )
-    Traceback (most recent call last):
-    ...
-    StopIteration
+    nothing()
     """
-    try:
-        return just(next(x for x in xs if condition(x)))
-    except StopIteration:
-        return nothing()
+    x = next(filter(condition, xs), _notFound)
+    return nothing() if x is _notFound else just(x)
 
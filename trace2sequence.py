@@ -21,8 +21,8 @@
 import argparse
 import os
 import re
+import subprocess
 import sys
-from collections import OrderedDict
 
 import config
 import customize
@@ -34,25 +34,26 @@ from funutils import Maybe, first, just
 # utilities
 
 def distinct(seq):
-    seen = set()
-    seen_add = seen.add
-    return [ x for x in seq if x not in seen and not seen_add(x)]
+    return list(dict.fromkeys(seq))
 
 
 # trace parser
 
+# Compile the regular expression for splitting a trace line into its fields.
+traceRegex = re.compile(customize.traceRegex)
+
 class TraceParser:
     """
     Parse trace lines and store parsed trace output.
     """
     def __init__(self):
         """
-        Initialize the TraceParser object. The regular expression for tracing
-        is also compiled at this time.
+        Initialize the TraceParser object. The precompiled trace regular
+        expression is shared by all parser objects.
         """
         self.statementList = []
-        self.objectDict = OrderedDict([])
-        self.regex = re.compile(customize.traceRegex)
+        self.objectDict = {}
+        self.regex = traceRegex
         self.attributes = {}
         self.usingDefaultComponent = False
 
@@ -64,25 +65,20 @@ class TraceParser:
         """
         # Parse the line using the precompiled regular expression
         messageGroup = self.regex.search(line)
-        if messageGroup != None:
-            self.attributes = messageGroup.groupdict()
-
+        if messageGroup is not None:
             # The type named group parsed from the regular expression is used
             # to identify the function that will be parse the trace body
-            traceType = self.attributes['type']
-            if traceType in customize.traceMapper:
-                traceBodyHandler = customize.traceMapper[traceType]
-            else:
-                traceBodyHandler = customize.defaultMapping
+            traceType = messageGroup['type']
+            traceBodyParser = fdl.traceTypeHandlers.get(traceType, fdl.defaultTraceHandler)
 
-            traceBodyParser = fdl.traceHandlerMapper[traceBodyHandler]
-            
             # Invoke the function to parse the body of the trace.
-            statement = traceBodyParser(traceType, self.attributes['generator'],self.attributes['body'])
+            statement = traceBodyParser(traceType, messageGroup['generator'], messageGroup['body'])
 
             # If trace parsing was successful, add a remark to the trace and then
-            # save the parsed statement.
-            if statement != None:
+            # save the parsed statement. The attribute dictionary is only built
+            # for traces that result in a statement.
+            if statement is not None:
+                self.attributes = messageGroup.groupdict()
                 statement.attributeUpdate(self.attributes)
                 self.saveStatement(statement)
 
@@ -103,7 +99,7 @@ class TraceParser:
         # The entityList override of the statement is used to obtain this information
         for entity, entityType in statement.entityList():
             obj = statement.attributes[entity]
-            if firstObj == None:
+            if firstObj is None:
                 firstObj = obj
             if obj in self.objectDict:
                 if self.objectDict[obj] == 'any':
@@ -144,12 +140,13 @@ class Document:
         """
         Private static method used when iterating over the object dictionary. The
         method takes the previous and the next type and determines if this represents
-        a type change.
+        a type change. Object types are either 'any' (eternal) or one of the
+        'dynamic-*' types, so a change is a switch between 'any' and not 'any'.
         :param previousType: The previous object type.
         :param nextType: The next object type
         :rvalue: True if a change is detected.
         """
-        return previousType != '' and ((previousType == 'any' and 'dynamic' in nextType) or ('dynamic' in previousType and nextType == 'any'))
+        return previousType != '' and (previousType == 'any') != (nextType == 'any')
 
     def generateDeclaration(self, objType, entities):
         """
@@ -161,112 +158,110 @@ class Document:
         """
         declType = 'eternal' if objType == 'any' else 'dynamic'
 
-        def createEntityWithParent(entity):
-            """
-            Create a string fragment of an object and its parent. This method is called to assemble the
-            full declaration.
-            :param entity: The entity for generating the fragment is passed as a parameter.
-            :rvalue: string fragment for forming the complete declaration.
-            """
-
-            if customize.objectParents:
-                parent = customize.objectParents.get(entity, 'Component')
-                entityWithParent = '"{0}" in "{1}"'.format(entity, parent)
-            else:
-                entityWithParent = entity
-            return entityWithParent
-
-        entitiesWithParent = map(createEntityWithParent, entities)
-        return declType + ': ' + ', '.join(entitiesWithParent) + '\n'
+        # If object grouping is enabled, declare each entity along with its parent.
+        # Entities without a listed parent belong to the default component. The
+        # check is made once per declaration rather than once per entity.
+        objectParents = customize.objectParents
+        if objectParents:
+            entities = [f'"{entity}" in "{objectParents.get(entity, "Component")}"' for entity in entities]
+        return declType + ': ' + ', '.join(entities) + '\n'
 
     def generateStyleAndTheme(self):
-        retStr = ''
+        parts = []
 
-        if config.themeTemplate != None:
-            retStr += '#include <{0}.FDL>\n'.format(config.themeTemplate)
+        if config.themeTemplate is not None:
+            parts.append(f'#include <{config.themeTemplate}.FDL>\n')
 
-        retStr += '#include <stdinc.FDL>\n\n'
+        parts.append('#include <stdinc.FDL>\n\n')
 
-        return retStr
+        return ''.join(parts)
 
     def generateHeader(self):
         """
-        Private method: Generate the FDL header
+        Private method: Generate the FDL header. The header fragments are collected
+        in a list and written to the file in a single call.
         """
-        header = ''
+        header = []
 
         # Include the style and theme information
-        header += self.generateStyleAndTheme()
+        header.append(self.generateStyleAndTheme())
 
         # Iterate over the object list and generate eternal and dynamic
         # declarations. The method generates a single declaration as long as it sees
         # objects of the same type. If the iterated object type changes, the method will
         # generate a new statement.
+        # The same pass also collects the objects that need an anonymous create
+        # in the feature block (see below).
         entityList = []
         previousType = ''
+        deletedCreates = []
 
         if customize.objectParents:
             parents = distinct(customize.objectParents.values())
             parentDeclaration = 'component: ' + ', '.join(['"' + parent + '"' for parent in parents]) + '\n'
-            header += parentDeclaration
+            header.append(parentDeclaration)
 
             if self.traceParser.usingDefaultComponent:
-                header += 'component: "Component"\n'
+                header.append('component: "Component"\n')
 
         for obj, objtype in self.traceParser.objectDict.items():
             if Document.hasTypeChanged(previousType, objtype):
-                header += self.generateDeclaration(previousType, entityList)
+                header.append(self.generateDeclaration(previousType, entityList))
                 entityList = []
             entityList.append(obj)
             previousType = objtype
+            if objtype == 'dynamic-deleted':
+                deletedCreates.append(f'create {obj}\n')
         if len(entityList) != 0:
-            header += self.generateDeclaration(previousType, entityList)
+            header.append(self.generateDeclaration(previousType, entityList))
 
         # Generate the start of a feature block
-        if config.themeTemplate == None:
-            header += '\nfeature "generated flow" {\n'
+        if config.themeTemplate is None:
+            header.append('\nfeature "generated flow" {\n')
         else:
-            header += '\n{MyTheme} feature "generated flow" {\n'
-        # The following code does an anonymous object create if an object delete
-        # has been encountered in the trace but the object was already created
-        # when tracing started. Such cases are flagged by a 'dynamic-deleted'
-        # object type.
-        for obj, objtype in self.traceParser.objectDict.items():
-            if 'dynamic-deleted' in objtype:
-                header += str.format('create {0}\n', obj)
+            header.append('\n{MyTheme} feature "generated flow" {\n')
+        # Do an anonymous object create if an object delete has been encountered
+        # in the trace but the object was already created when tracing started.
+        # Such cases are flagged by a 'dynamic-deleted' object type.
+        header.extend(deletedCreates)
 
         # Write the complete header to the file
-        self.ofile.write(header)
+        self.ofile.write(''.join(header))
 
     def checkAndGenerateBookmark(self, statement):
         """
         Private method. Traces to be bookmarked should be specified in customize.py file. A PDF bookmark
         should be generated if a trace segment matches the customize.py bookmark specification.
-        This method checks and prefixes a bookmark.
+        This method checks and returns the bookmark prefix.
         :param statement: Statement to be checked for a bookmark.
+        :rvalue: bookmark heading string or an empty string if no bookmark is needed.
         """
         # Extract the bookmarking attribute. Proceed only if a bookmark attribute
         # is defined for the statement.
         bookmarkAttribute = statement.bookmarkAttribute()
         if bookmarkAttribute == '':
-            return
+            return ''
         bookmarkText = statement.attributes[bookmarkAttribute]
 
         # If the bookmarking text is found, prefix the bookmark as heading statement
         if  bookmarkText in customize.bookmarks:
-            bookmarkStr = config.indent+ str.format(customize.bookmarkTemplate, bookmark = bookmarkText)+'\n'
-            self.ofile.write(bookmarkStr)
+            return config.indent+ str.format(customize.bookmarkTemplate, bookmark = bookmarkText)+'\n'
+        return ''
 
     def generateBody(self):
         """
         Private method. This method generates all the FDL file body by iterating
         over the statements extracted from the traces. Bookmarks are also generated
-        from this method.
+        from this method. The body is assembled in memory and written to the file
+        in a single call.
         """
+        body = []
+        append = body.append
+        checkAndGenerateBookmark = self.checkAndGenerateBookmark
         for statement in self.traceParser.statementList:
-            fdlStatement = statement.generateStatement()
-            self.checkAndGenerateBookmark(statement)
-            self.ofile.write(fdlStatement)
+            append(checkAndGenerateBookmark(statement))
+            append(statement.generateStatement())
+        self.ofile.write(''.join(body))
 
     def generateFooter(self):
         """
@@ -297,11 +292,18 @@ def generateOutputWithEventStudio():
     Run EventStudio to automatically generate the sequence diagram.
     """
 
-    eventStudioDirectory = just(config.eventStudioPath) if config.eventStudioPath else findEventStudioVSCodePath(os.path.expandvars(config.vsCodeExtensions))
+    eventStudioDirectory = just(os.path.expandvars(config.eventStudioPath)) if config.eventStudioPath else findEventStudioVSCodePath(os.path.expandvars(config.vsCodeExtensions))
     eventStudio = eventStudioDirectory.map(lambda p : os.path.join(p, 'evstudio.exe'))
-    commandLine = eventStudio.map(lambda p : str.format(config.eventStudioCommandLine, eventStudio = '"' + p + '"'))
+    # No command shell is involved, so environment variables in the command line
+    # are expanded here.
+    commandLine = eventStudio.map(lambda p : str.format(os.path.expandvars(config.eventStudioCommandLine), eventStudio = '"' + p + '"'))
     if commandLine.hasValue:
-        os.system(commandLine.value)
+        # Launch EventStudio directly rather than through a command shell.
+        try:
+            subprocess.run(commandLine.value)
+        except OSError as error:
+            print('Could not run EventStudio:', error)
+            exit()
     else:
         print('Could not find EventStudio')
         exit()
@@ -330,7 +332,9 @@ def main():
 
 
 def findEventStudioVSCodePath(extensionsPath) -> Maybe[str]:
-    return first(os.listdir(extensionsPath), lambda x: os.path.basename(x).lower().startswith('eventhelix.eventstudio-')).map(lambda p : os.path.join(extensionsPath, p))
+    # Scan the extension directories lazily and stop at the first EventStudio match.
+    with os.scandir(extensionsPath) as entries:
+        return first(entries, lambda x: x.name.lower().startswith('eventhelix.eventstudio-')).map(lambda p : p.path)
 
 if __name__ == '__main__':
     main()